@@ -1,4 +1,6 @@
 import os
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
@@ -15,9 +17,13 @@ from utils import (
     get_missing_smtp_env_keys,
     generate_learning_notes,
     load_environment,
+    map_attachment,
+    prefetch_playlist_videos,
+    reload_smtp_config,
     search_youtube_playlist,
     search_youtube_videos,
     create_learning_playlist,
+    SMTPSession,
     send_email_with_attachment,
     validate_email_address,
 )
@@ -25,6 +31,24 @@ from utils import (
 console = Console()
 
 
+def run_in_background(fn, *args) -> Future:
+    """Run fn(*args) on a daemon thread and return a Future for its result.
+
+    A daemon thread is used so interrupting a prompt (Ctrl-C) exits right away
+    instead of waiting for in-flight network calls to finish.
+    """
+    future: Future = Future()
+
+    def _run() -> None:
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=_run, daemon=True).start()
+    return future
+
+
 def configure_smtp_interactively() -> bool:
     """Prompt the user for missing SMTP settings and set them in the process env."""
     console.print("[yellow]SMTP settings are required to send email.[/yellow]")
@@ -47,6 +71,7 @@ def configure_smtp_interactively() -> bool:
     os.environ["EMAIL_FROM"] = email_from
     os.environ["EMAIL_FROM_NAME"] = email_from_name
     os.environ.setdefault("SMTP_TIMEOUT", "30")
+    reload_smtp_config()
 
     if Confirm.ask("Save these settings to .env for next time?", default=False):
         try:
@@ -95,7 +120,7 @@ def display_playlist_summary(playlist_data: dict) -> None:
     for day_key, day_data in list(playlist_data['daily_schedule'].items())[:3]:  # Show first 3 days
         console.print(f"\n[bold]{day_key.replace('_', ' ').title()}:[/bold]")
         for video in day_data['videos']:
-            console.print(f"  • [link={video['url']}]{video['title']}[/link] ({video['duration']})")
+            console.print(f"  • [link={video.url}]{video.title}[/link] ({video.duration})")
 
 
 def main() -> None:
@@ -120,11 +145,24 @@ def main() -> None:
     qs = ClarifyingQuestions()
     console.print(f"\n[bold]Let's personalize your learning path:[/bold]")
     answer_one = Prompt.ask(qs.question_one)
+
+    # The search queries only depend on topic and background, so run them in the
+    # background while the user answers the next question. Errors are collected
+    # rather than printed so they don't land in the middle of the prompt.
+    prefetch_errors: list = []
+    prefetch = run_in_background(prefetch_playlist_videos, topic, answer_one, prefetch_errors)
     answer_two = Prompt.ask(qs.question_two)
 
     # Create comprehensive learning playlist
     console.print(f"\n[bold]🎥 Creating your personalized YouTube learning playlist...[/bold]")
-    playlist_data = create_learning_playlist(topic, answer_one, answer_two)
+    try:
+        search_results = prefetch.result()
+    except Exception as e:
+        console.print(f"[yellow]⚠️  Background video search failed: {e}[/yellow]")
+        search_results = None  # Let the playlist step search again
+    for message in prefetch_errors:
+        console.print(f"[yellow]{message}[/yellow]")
+    playlist_data = create_learning_playlist(topic, answer_one, answer_two, search_results)
     
     if playlist_data['total_videos'] > 0:
         console.print(f"[green]✅ Successfully created playlist with {playlist_data['total_videos']} videos![/green]")
@@ -163,9 +201,6 @@ def main() -> None:
         
         if not missing:
             try:
-                with open(pdf_path, "rb") as f:
-                    pdf_bytes = f.read()
-                
                 # Create enhanced email body
                 email_body = f"""Hello! 👋
 
@@ -206,13 +241,15 @@ Best of luck with your {topic} learning adventure!
 Generated on: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
 """
                 
-                sent = send_email_with_attachment(
-                    to_address=email,
-                    subject=f"🎓 Your {topic} Learning Path - Daily YouTube Playlist Included!",
-                    body_text=email_body,
-                    attachment_bytes=pdf_bytes,
-                    attachment_filename=pdf_name,
-                )
+                with SMTPSession() as smtp_session, map_attachment(pdf_path) as pdf_bytes:
+                    sent = send_email_with_attachment(
+                        to_address=email,
+                        subject=f"🎓 Your {topic} Learning Path - Daily YouTube Playlist Included!",
+                        body_text=email_body,
+                        attachment_bytes=pdf_bytes,
+                        attachment_filename=pdf_name,
+                        session=smtp_session,
+                    )
                 
                 if sent:
                     console.print(f"[green]✅ Email sent successfully to[/green] {email}")
@@ -1,18 +1,29 @@
+import asyncio
 import os
 import io
+import hashlib
+import time
 import smtplib
 import ssl
+import mmap
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Tuple, List, Dict
-import json
+from itertools import accumulate, chain, islice
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional, Tuple, List, Dict, Union
+import re
 
 from email.message import EmailMessage
 
+import orjson
 from dotenv import load_dotenv
-from email_validator import validate_email, EmailNotValidError
-from fpdf import FPDF
-import google.generativeai as genai
-from youtubesearchpython import PlaylistsSearch, VideosSearch
+
+# Heavy third-party modules are imported inside the functions that use them,
+# so runs that skip AI, email or fresh searches don't pay their import cost.
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 
 def load_environment() -> None:
@@ -22,6 +33,8 @@ def load_environment() -> None:
 
 def validate_email_address(email: str) -> bool:
     """Validate email address format."""
+    from email_validator import validate_email, EmailNotValidError
+
     try:
         validate_email(email)
         return True
@@ -36,47 +49,246 @@ def ensure_output_dir() -> str:
     return output_dir
 
 
+YOUTUBE_CACHE_DIR = os.path.join(".cache", "yt")
+YOUTUBE_CACHE_TTL = 24 * 60 * 60  # 24 hours for successful lookups
+YOUTUBE_EMPTY_CACHE_TTL = 60 * 60  # 1 hour for empty/failed lookups, to avoid hammering YouTube
+
+
+def _youtube_cache_path(key: str) -> str:
+    """Return the on-disk cache file path for a cache key."""
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(YOUTUBE_CACHE_DIR, f"{digest}.json")
+
+
+def _read_youtube_cache(key: str):
+    """Return (hit, value) for a cached YouTube lookup that has not expired."""
+    try:
+        with open(_youtube_cache_path(key), "rb") as f:
+            entry = orjson.loads(f.read())
+        # Entries are [timestamp, value]; anything else is treated as a miss
+        if not isinstance(entry, list) or len(entry) != 2:
+            return False, None
+        timestamp, value = entry
+        if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+            return False, None
+        ttl = YOUTUBE_CACHE_TTL if value else YOUTUBE_EMPTY_CACHE_TTL
+        if time.time() - timestamp < ttl:
+            return True, value
+    except (OSError, ValueError, TypeError):
+        pass
+    return False, None
+
+
+def _write_youtube_cache(key: str, value) -> None:
+    """Store a YouTube lookup result on disk; failures are ignored."""
+    path = _youtube_cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(YOUTUBE_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps([time.time(), value]))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+class VideoInfo(NamedTuple):
+    """A single YouTube search result."""
+    title: str
+    url: str
+    duration: str
+    views: str
+    channel: str
+    description: str
+
+
+def _video_cache_key(query: str, max_results: int) -> str:
+    """Return the cache key for a video search (versioned with the VideoInfo layout)."""
+    return f"videos:v2:{max_results}:{query}"
+
+
+def _read_video_cache(query: str, max_results: int) -> Optional[List[VideoInfo]]:
+    """Return cached videos for a search, or None on a miss or a malformed entry."""
+    hit, cached = _read_youtube_cache(_video_cache_key(query, max_results))
+    if not hit:
+        return None
+    try:
+        return [VideoInfo(*video) for video in cached]
+    except TypeError:
+        return None
+
+
+YOUTUBE_SEARCH_URL = "https://www.youtube.com/results"
+_YOUTUBE_VIDEO_FILTER = "EgIQAQ=="  # "sp" search param restricting results to videos
+_YOUTUBE_PLAYLIST_FILTER = "EgIQAw=="  # "sp" search param restricting results to playlists
+_YOUTUBE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+_YT_INITIAL_DATA_RE = re.compile(r"var ytInitialData = (.+?);</script>", re.DOTALL)
+
+
+def _youtube_session():
+    """Create a pooled HTTP session for YouTube requests (must run inside an event loop)."""
+    import aiohttp
+
+    return aiohttp.ClientSession(
+        headers=_YOUTUBE_HEADERS,
+        connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
+
+async def _fetch_youtube_search(session, query: str, search_filter: str) -> Dict:
+    """Fetch a YouTube results page and return its embedded ytInitialData."""
+    params = {"search_query": query, "sp": search_filter}
+    async with session.get(YOUTUBE_SEARCH_URL, params=params) as response:
+        response.raise_for_status()
+        html = await response.text()
+    match = _YT_INITIAL_DATA_RE.search(html)
+    if not match:
+        raise ValueError("ytInitialData not found in YouTube search page")
+    return orjson.loads(match.group(1))
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """Return True if a search failed because YouTube answered 429 Too Many Requests."""
+    return getattr(exc, "status", None) == 429
+
+
+def _iter_renderers(node, renderer_key: str) -> Iterator[Dict]:
+    """Yield every ``renderer_key`` object nested anywhere in ytInitialData, in page order."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == renderer_key and isinstance(value, dict):
+                yield value
+            else:
+                yield from _iter_renderers(value, renderer_key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_renderers(item, renderer_key)
+
+
+def _youtube_text(field: Optional[Dict]) -> str:
+    """Flatten a YouTube text object ({"simpleText": ...} or {"runs": [...]})."""
+    if not field:
+        return ""
+    if "simpleText" in field:
+        return field["simpleText"]
+    return "".join(run.get("text", "") for run in field.get("runs", []))
+
+
+def _parse_video_renderer(renderer: Dict) -> VideoInfo:
+    """Convert a videoRenderer object into a VideoInfo."""
+    snippets = renderer.get("detailedMetadataSnippets") or []
+    description = _youtube_text(snippets[0].get("snippetText")) if snippets else ""
+    return VideoInfo(
+        title=_youtube_text(renderer.get("title")),
+        url=f"https://www.youtube.com/watch?v={renderer['videoId']}",
+        duration=_youtube_text(renderer.get("lengthText")),
+        views=_youtube_text(renderer.get("viewCountText")),
+        channel=_youtube_text(renderer.get("ownerText")),
+        description=description[:200] + "..." if description else "",
+    )
+
+
 def search_youtube_playlist(query: str) -> Optional[str]:
     """Search for YouTube playlists and return the first result URL."""
-    try:
-        search = PlaylistsSearch(query, limit=1)
-        results = search.result()
-        if results and "result" in results and results["result"]:
-            return results["result"][0]["link"]
+    cache_key = f"playlist:{query}"
+    hit, cached = _read_youtube_cache(cache_key)
+    if hit:
+        return cached
+
+    async def _search() -> Optional[str]:
+        async with _youtube_session() as session:
+            data = await _fetch_youtube_search(session, query, _YOUTUBE_PLAYLIST_FILTER)
+        for renderer in _iter_renderers(data, "playlistRenderer"):
+            if renderer.get("playlistId"):
+                return f"https://www.youtube.com/playlist?list={renderer['playlistId']}"
         return None
+
+    try:
+        link = asyncio.run(_search())
     except Exception as e:
         print(f"YouTube search failed: {e}")
-        return None
+        if not _is_rate_limited(e):
+            return None  # Only cache rate limiting, not transient network or parse failures
+        link = None
 
+    _write_youtube_cache(cache_key, link)
+    return link
 
-def search_youtube_videos(query: str, max_results: int = 10) -> List[Dict]:
-    """Search for YouTube videos and return a list of video information."""
+
+def _report_search_error(message: str, errors: Optional[List[str]]) -> None:
+    """Print a search failure, or collect it into ``errors`` when the caller wants to report later."""
+    if errors is None:
+        print(message)
+    else:
+        errors.append(message)
+
+
+async def _search_youtube_videos_async(
+    session, query: str, max_results: int, errors: Optional[List[str]] = None
+) -> List[VideoInfo]:
+    """Search YouTube videos over an existing session, caching the result."""
     try:
-        search = VideosSearch(query, limit=max_results)
-        results = search.result()
-        videos = []
-        
-        if results and "result" in results:
-            for video in results["result"]:
-                video_info = {
-                    "title": video.get("title", ""),
-                    "url": video.get("link", ""),
-                    "duration": video.get("duration", ""),
-                    "views": video.get("viewCount", {}).get("text", ""),
-                    "channel": video.get("channel", {}).get("name", ""),
-                    "description": video.get("descriptionSnippet", [{}])[0].get("text", "")[:200] + "..." if video.get("descriptionSnippet") else ""
-                }
-                videos.append(video_info)
-        
-        return videos
+        data = await _fetch_youtube_search(session, query, _YOUTUBE_VIDEO_FILTER)
+        renderers = (r for r in _iter_renderers(data, "videoRenderer") if r.get("videoId"))
+        videos = [_parse_video_renderer(r) for r in islice(renderers, max_results)]
     except Exception as e:
-        print(f"YouTube video search failed: {e}")
-        return []
+        _report_search_error(f"YouTube video search failed: {e}", errors)
+        if not _is_rate_limited(e):
+            return []  # Only cache rate limiting, not transient network or parse failures
+        videos = []
 
+    _write_youtube_cache(_video_cache_key(query, max_results), [tuple(video) for video in videos])
+    return videos
+
+
+def search_youtube_videos_batch(
+    queries: List[str], max_results: int = 10, errors: Optional[List[str]] = None
+) -> List[List[VideoInfo]]:
+    """Search YouTube videos for several queries concurrently over one pooled session.
+
+    Returns one list of video information per query, in the same order. Failures
+    are printed, or appended to ``errors`` if given (e.g. for background searches).
+    """
+    results = {}
+    pending = []
+    for query in queries:
+        cached = _read_video_cache(query, max_results)
+        if cached is not None:
+            results[query] = cached
+        elif query not in pending:
+            pending.append(query)
+
+    if pending:
+        async def _search_all() -> List[List[VideoInfo]]:
+            async with _youtube_session() as session:
+                return await asyncio.gather(
+                    *(_search_youtube_videos_async(session, query, max_results, errors) for query in pending)
+                )
 
-def create_learning_playlist(topic: str, background: str, commitment: str) -> Dict:
-    """Create a structured learning playlist with video recommendations."""
-    # Generate search queries based on topic and background
+        try:
+            found = asyncio.run(_search_all())
+        except Exception as e:
+            _report_search_error(f"YouTube video search failed: {e}", errors)
+            found = [[] for _ in pending]
+        results.update(zip(pending, found))
+
+    return [results[query] for query in queries]
+
+
+def search_youtube_videos(query: str, max_results: int = 10) -> List[VideoInfo]:
+    """Search for YouTube videos and return a list of video information."""
+    return search_youtube_videos_batch([query], max_results)[0]
+
+
+PLAYLIST_VIDEOS_PER_QUERY = 3
+
+
+def build_search_queries(topic: str, background: str) -> Tuple[str, List[str]]:
+    """Pick a difficulty level from the background and build matching search queries."""
     if "beginner" in background.lower() or "absolute" in background.lower():
         difficulty = "beginner"
         search_queries = [
@@ -101,22 +313,44 @@ def create_learning_playlist(topic: str, background: str, commitment: str) -> Di
             f"{topic} advanced concepts",
             f"{topic} professional development"
         ]
+    return difficulty, search_queries
+
+
+def prefetch_playlist_videos(
+    topic: str, background: str, errors: Optional[List[str]] = None
+) -> List[List[VideoInfo]]:
+    """Run the playlist's video searches ahead of time; pass the result to create_learning_playlist."""
+    _, search_queries = build_search_queries(topic, background)
+    return search_youtube_videos_batch(search_queries, max_results=PLAYLIST_VIDEOS_PER_QUERY, errors=errors)
+
+
+def create_learning_playlist(
+    topic: str,
+    background: str,
+    commitment: str,
+    search_results: Optional[List[List[VideoInfo]]] = None,
+) -> Dict:
+    """Create a structured learning playlist with video recommendations.
+
+    ``search_results`` may hold the output of ``prefetch_playlist_videos`` for the
+    same topic and background, in which case no searches are run here.
+    """
+    # Generate search queries based on topic and background
+    difficulty, search_queries = build_search_queries(topic, background)
     
-    # Search for videos using different queries
-    all_videos = []
-    for query in search_queries:
-        videos = search_youtube_videos(query, max_results=3)
-        all_videos.extend(videos)
+    # Search for videos using different queries (concurrently, since each is a network round-trip)
+    if search_results is None:
+        search_results = search_youtube_videos_batch(search_queries, max_results=PLAYLIST_VIDEOS_PER_QUERY)
+    all_videos = list(chain.from_iterable(search_results))
     
-    # Remove duplicates and limit results
-    unique_videos = []
-    seen_urls = set()
+    # Remove duplicates (first occurrence wins) and limit results
+    videos_by_url = {}
     for video in all_videos:
-        if video["url"] not in seen_urls and len(unique_videos) < 15:
-            unique_videos.append(video)
-            seen_urls.add(video["url"])
+        videos_by_url.setdefault(video.url, video)
+    unique_videos = list(islice(videos_by_url.values(), 15))
     
-    # Organize videos by learning phase
+    # Organize videos by learning phase (slicing past the end just yields an empty list)
+    foundation_videos, core_videos, advanced_videos = unique_videos[:5], unique_videos[5:10], unique_videos[10:]
     playlist_structure = {
         "topic": topic,
         "difficulty": difficulty,
@@ -128,17 +362,17 @@ def create_learning_playlist(topic: str, background: str, commitment: str) -> Di
             "phase_1": {
                 "name": "Foundation",
                 "description": "Build basic understanding and concepts",
-                "videos": unique_videos[:5] if len(unique_videos) >= 5 else unique_videos
+                "videos": foundation_videos
             },
             "phase_2": {
                 "name": "Core Learning",
                 "description": "Deep dive into main concepts and practical examples",
-                "videos": unique_videos[5:10] if len(unique_videos) >= 10 else unique_videos[5:] if len(unique_videos) > 5 else []
+                "videos": core_videos
             },
             "phase_3": {
                 "name": "Advanced Application",
                 "description": "Advanced topics and real-world applications",
-                "videos": unique_videos[10:] if len(unique_videos) > 10 else []
+                "videos": advanced_videos
             }
         },
         "daily_schedule": generate_daily_schedule(unique_videos, commitment),
@@ -148,38 +382,32 @@ def create_learning_playlist(topic: str, background: str, commitment: str) -> Di
     return playlist_structure
 
 
-def generate_daily_schedule(videos: List[Dict], commitment: str) -> Dict:
+_COMMITMENT_HOURS_RE = re.compile(
+    r"(?:(?<![\d.])(\d+(?:\.\d+)?)|\b(one|two|three))\s*hours?\b", re.IGNORECASE
+)
+_COMMITMENT_WORD_NUMBERS = {"one": 1, "two": 2, "three": 3}
+
+
+def generate_daily_schedule(videos: List[VideoInfo], commitment: str) -> Dict:
     """Generate a daily learning schedule based on commitment level."""
     total_videos = len(videos)
     
-    # Parse commitment to determine daily video count
-    if "hour" in commitment.lower():
-        if "1" in commitment or "one" in commitment:
-            daily_videos = 1
-        elif "2" in commitment or "two" in commitment:
-            daily_videos = 2
-        elif "3" in commitment or "three" in commitment:
-            daily_videos = 3
-        else:
-            daily_videos = 2
+    # Parse commitment to determine daily video count (1-3, default 2 videos per day)
+    match = _COMMITMENT_HOURS_RE.search(commitment)
+    if match and match.group(1):
+        daily_videos = min(max(int(float(match.group(1))), 1), 3)
+    elif match:
+        daily_videos = _COMMITMENT_WORD_NUMBERS[match.group(2).lower()]
     else:
-        daily_videos = 2  # Default to 2 videos per day
+        daily_videos = 2
     
     days_needed = max(1, total_videos // daily_videos)
     
     schedule = {}
-    video_index = 0
     
     for day in range(1, days_needed + 1):
-        day_videos = []
-        for _ in range(daily_videos):
-            if video_index < total_videos:
-                day_videos.append({
-                    "title": videos[video_index]["title"],
-                    "url": videos[video_index]["url"],
-                    "duration": videos[video_index]["duration"]
-                })
-                video_index += 1
+        start = (day - 1) * daily_videos
+        day_videos = videos[start:start + daily_videos]
         
         schedule[f"day_{day}"] = {
             "videos": day_videos,
@@ -190,43 +418,20 @@ def generate_daily_schedule(videos: List[Dict], commitment: str) -> Dict:
     return schedule
 
 
-def build_ai_client() -> Optional[genai.GenerativeModel]:
+def build_ai_client() -> Optional["genai.GenerativeModel"]:
     """Build Gemini client if API key is available."""
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         return None
+    import google.generativeai as genai
+
     genai.configure(api_key=api_key)
     return genai.GenerativeModel('gemini-pro')
 
 
-def generate_learning_notes(topic: str, background: str, commitment: str, playlist_data: Dict = None) -> str:
-    """Generate learning notes using AI or fallback content."""
-    client = build_ai_client()
-    
-    if client:
-        try:
-            base_context = f"""
-            Topic: {topic}
-            Background: {background}
-            Commitment: {commitment}
-            
-            Generate a comprehensive learning path with:
-            1. Prerequisites
-            2. Learning objectives
-            3. Step-by-step curriculum
-            4. Recommended resources
-            5. Practice exercises
-            6. Timeline estimates
-            """
-            
-            response = client.generate_content(base_context)
-            return response.text
-        except Exception as e:
-            print(f"AI generation failed: {e}")
-    
-    # Fallback content
-    notes = f"""
-LEARNING PATH: {topic.upper()}
+# Fallback notes are filled in with str.format; keep them free of stray braces.
+_FALLBACK_NOTES_TEMPLATE = """
+LEARNING PATH: {topic_upper}
 
 PREREQUISITES:
 - Basic computer literacy
@@ -288,46 +493,37 @@ Your commitment: {commitment}
 
 Remember: Learning is a journey, not a destination. Stay patient and persistent!
 """
-    
-    # Add playlist information if available
-    if playlist_data:
-        notes += f"""
+
+_PLAYLIST_NOTES_TEMPLATE = """
 
 🎥 DAILY YOUTUBE LEARNING PLAYLIST
 
-Topic: {playlist_data['topic']}
-Difficulty Level: {playlist_data['difficulty'].title()}
-Total Videos: {playlist_data['total_videos']}
-Estimated Total Time: {playlist_data['estimated_hours']:.1f} hours
+Topic: {topic}
+Difficulty Level: {difficulty}
+Total Videos: {total_videos}
+Estimated Total Time: {estimated_hours:.1f} hours
 
 📚 LEARNING PHASES:
 
-Phase 1: {playlist_data['phases']['phase_1']['name']}
-{playlist_data['phases']['phase_1']['description']}
-Videos: {len(playlist_data['phases']['phase_1']['videos'])} videos
+Phase 1: {phases[phase_1][name]}
+{phases[phase_1][description]}
+Videos: {phase_1_video_count} videos
 
-Phase 2: {playlist_data['phases']['phase_2']['name']}
-{playlist_data['phases']['phase_2']['description']}
-Videos: {len(playlist_data['phases']['phase_2']['videos'])} videos
+Phase 2: {phases[phase_2][name]}
+{phases[phase_2][description]}
+Videos: {phase_2_video_count} videos
 
-Phase 3: {playlist_data['phases']['phase_3']['name']}
-{playlist_data['phases']['phase_3']['description']}
-Videos: {len(playlist_data['phases']['phase_3']['videos'])} videos
+Phase 3: {phases[phase_3][name]}
+{phases[phase_3][description]}
+Videos: {phase_3_video_count} videos
 
 📅 DAILY SCHEDULE:
 """
-        
-        for day_key, day_data in playlist_data['daily_schedule'].items():
-            notes += f"\n{day_key.replace('_', ' ').title()}:"
-            notes += f"\n- Focus: {day_data['focus']}"
-            notes += f"\n- Estimated Time: {day_data['estimated_time']:.1f} hours"
-            notes += f"\n- Videos:"
-            for video in day_data['videos']:
-                notes += f"\n  • {video['title']} ({video['duration']})"
-                notes += f"\n    Link: {video['url']}"
-            notes += "\n"
-        
-        notes += f"""
+
+_DAY_NOTES_TEMPLATE = "\n{day}:\n- Focus: {focus}\n- Estimated Time: {estimated_time:.1f} hours\n- Videos:"
+_VIDEO_NOTES_TEMPLATE = "\n  • {video.title} ({video.duration})\n    Link: {video.url}"
+
+_PLAYLIST_TIPS_TEMPLATE = """
 🎯 DAILY LEARNING TIPS:
 - Watch videos at your own pace
 - Take notes while watching
@@ -336,15 +532,79 @@ Videos: {len(playlist_data['phases']['phase_3']['videos'])} videos
 - Stay consistent with your daily schedule
 
 🔗 PLAYLIST SEARCH QUERIES USED:
-{', '.join(playlist_data['search_queries'])}
+{search_queries}
 """
+
+
+def generate_learning_notes(topic: str, background: str, commitment: str, playlist_data: Dict = None) -> str:
+    """Generate learning notes using AI or fallback content."""
+    client = build_ai_client()
     
-    return notes
+    if client:
+        try:
+            base_context = f"""
+            Topic: {topic}
+            Background: {background}
+            Commitment: {commitment}
+            
+            Generate a comprehensive learning path with:
+            1. Prerequisites
+            2. Learning objectives
+            3. Step-by-step curriculum
+            4. Recommended resources
+            5. Practice exercises
+            6. Timeline estimates
+            """
+            
+            # Stream the response so chunks are consumed as they arrive
+            response = client.generate_content(base_context, stream=True)
+            buf = io.StringIO()
+            for chunk in response:
+                buf.write(chunk.text)
+            return buf.getvalue()
+        except Exception as e:
+            print(f"AI generation failed: {e}")
+    
+    # Fallback content, collected as fragments and joined once at the end
+    parts = [_FALLBACK_NOTES_TEMPLATE.format(
+        topic=topic, topic_upper=topic.upper(), background=background, commitment=commitment
+    )]
+    
+    # Add playlist information if available
+    if playlist_data:
+        phases = playlist_data['phases']
+        parts.append(_PLAYLIST_NOTES_TEMPLATE.format(
+            topic=playlist_data['topic'],
+            difficulty=playlist_data['difficulty'].title(),
+            total_videos=playlist_data['total_videos'],
+            estimated_hours=playlist_data['estimated_hours'],
+            phases=phases,
+            phase_1_video_count=len(phases['phase_1']['videos']),
+            phase_2_video_count=len(phases['phase_2']['videos']),
+            phase_3_video_count=len(phases['phase_3']['videos']),
+        ))
+        
+        for day_key, day_data in playlist_data['daily_schedule'].items():
+            parts.append(_DAY_NOTES_TEMPLATE.format(
+                day=day_key.replace('_', ' ').title(),
+                focus=day_data['focus'],
+                estimated_time=day_data['estimated_time'],
+            ))
+            parts.extend(_VIDEO_NOTES_TEMPLATE.format(video=video) for video in day_data['videos'])
+            parts.append("\n")
+        
+        parts.append(_PLAYLIST_TIPS_TEMPLATE.format(search_queries=', '.join(playlist_data['search_queries'])))
+    
+    return "".join(parts)
 
 
 def create_pdf_from_text(title: str, body_text: str, output_path: str) -> None:
     """Create a PDF from text content with proper formatting."""
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+
     pdf = FPDF()
+    pdf.set_compression(True)  # zlib-compress page content streams to shrink output
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
 
@@ -357,60 +617,81 @@ def create_pdf_from_text(title: str, body_text: str, output_path: str) -> None:
     pdf.set_font("Helvetica", size=12)
     line_height = 7
     page_width = pdf.w - pdf.l_margin - pdf.r_margin
+    # Body cells return to the left margin on the next line, so no per-line set_x is needed
+    next_line = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+
+    char_widths: Dict[Tuple[float, str], float] = {}
+    word_widths: Dict[Tuple[float, str], float] = {}
+
+    def _char_width(char: str, font_size: float) -> float:
+        """Return the width of a single character at the current font, memoized."""
+        key = (font_size, char)
+        width = char_widths.get(key)
+        if width is None:
+            width = char_widths[key] = pdf.get_string_width(char)
+        return width
+
+    def _word_width(word: str, font_size: float) -> float:
+        """Return the width of a word at the current font, memoized."""
+        key = (font_size, word)
+        width = word_widths.get(key)
+        if width is None:
+            width = word_widths[key] = pdf.get_string_width(word)
+        return width
 
     def _split_token_to_fit(token: str, font_size: float, available_width: float) -> List[str]:
         """Split a long token into chunks that fit the available width."""
         pdf.set_font("Helvetica", size=font_size)
+        # Core font metrics have no kerning, so a prefix's width is the running
+        # sum of its character widths; binary-search that for each chunk end.
+        offsets = list(accumulate(_char_width(char, font_size) for char in token))
         chunks = []
-        current_chunk = ""
-        for char in token:
-            if pdf.get_string_width(current_chunk + char) < available_width:
-                current_chunk += char
-            else:
-                chunks.append(current_chunk)
-                current_chunk = char
-                
-        if current_chunk:
-            chunks.append(current_chunk)
+        start = 0
+        consumed = 0.0
+        while start < len(token):
+            end = bisect_left(offsets, consumed + available_width, start)
+            end = max(end, start + 1)  # Always make progress, even if one char is too wide
+            chunks.append(token[start:end])
+            consumed = offsets[end - 1]
+            start = end
         return chunks
 
     def _render_wrapped_text(text: str, font_size: float, line_height: float, available_width: float):
         """Render text with proper word wrapping."""
         pdf.set_font("Helvetica", size=font_size)
+        space_width = _char_width(' ', font_size)
         words = text.split(' ')
         current_line = []
+        current_width = 0.0
         
         for word in words:
+            word_width = _word_width(word, font_size)
             # Handle very long words that exceed line width
-            if pdf.get_string_width(word) > available_width:
+            if word_width > available_width:
                 if current_line:  # Render what's accumulated before handling the long word
-                    pdf.multi_cell(available_width, line_height, ' '.join(current_line))
-                    pdf.set_x(pdf.l_margin)
+                    pdf.multi_cell(available_width, line_height, ' '.join(current_line), **next_line)
                     current_line = []
+                    current_width = 0.0
                 # Split the long word and render its chunks
                 chunks = _split_token_to_fit(word, font_size, available_width)
                 for chunk in chunks:
-                    pdf.multi_cell(available_width, line_height, chunk)
-                    pdf.set_x(pdf.l_margin)
+                    pdf.multi_cell(available_width, line_height, chunk, **next_line)
             else:
-                test_line = ' '.join(current_line + [word])
-                if pdf.get_string_width(test_line) < available_width:
+                # Track the line width incrementally instead of re-measuring the joined line
+                test_width = current_width + space_width + word_width if current_line else word_width
+                if test_width < available_width:
                     current_line.append(word)
+                    current_width = test_width
                 else:
-                    pdf.multi_cell(available_width, line_height, ' '.join(current_line))
-                    pdf.set_x(pdf.l_margin)
+                    pdf.multi_cell(available_width, line_height, ' '.join(current_line), **next_line)
                     current_line = [word]
+                    current_width = word_width
         
         if current_line:
-            pdf.multi_cell(available_width, line_height, ' '.join(current_line))
-            pdf.set_x(pdf.l_margin)
+            pdf.multi_cell(available_width, line_height, ' '.join(current_line), **next_line)
 
-    for line in body_text.splitlines():
-        pdf.set_x(pdf.l_margin)  # Reset X position for each line
-        if not line.strip():
-            pdf.ln(4)
-            continue
-        
+    def _render_line(line: str) -> None:
+        """Render a single line with manual wrapping, falling back to a smaller font."""
         try:
             _render_wrapped_text(line, 12, line_height, page_width)
         except Exception:
@@ -420,9 +701,35 @@ def create_pdf_from_text(title: str, body_text: str, output_path: str) -> None:
             except Exception:
                 # Last resort: skip problematic lines
                 print(f"Warning: Could not render line: {line[:50]}...")
-                continue
 
-    pdf.output(output_path)
+    def _render_paragraph(lines: List[str]) -> None:
+        """Render a run of non-empty lines, letting FPDF wrap them in one multi_cell call."""
+        pdf.set_x(pdf.l_margin)
+        try:
+            pdf.set_font("Helvetica", size=12)
+            # Words wider than the page need the manual splitting path
+            if all(_word_width(word, 12) <= page_width for line in lines for word in line.split(' ')):
+                pdf.multi_cell(page_width, line_height, '\n'.join(lines), align="L", **next_line)
+                return
+        except Exception:
+            pass  # e.g. characters the core font can't encode; handle line by line below
+        for line in lines:
+            _render_line(line)
+
+    paragraph: List[str] = []
+    for line in body_text.splitlines():
+        if line.strip():
+            paragraph.append(line)
+            continue
+        if paragraph:
+            _render_paragraph(paragraph)
+            paragraph = []
+        pdf.ln(4)
+    if paragraph:
+        _render_paragraph(paragraph)
+
+    with open(output_path, "wb") as fh:
+        pdf.output(fh)
 
 
 def build_pdf_filename(topic: str) -> Tuple[str, str]:
@@ -434,39 +741,166 @@ def build_pdf_filename(topic: str) -> Tuple[str, str]:
     return filename, full_path
 
 
+# Required SMTP environment variables, paired with the SMTPConfig field each one fills
+_REQUIRED_SMTP_KEYS = (
+    ("EMAIL_FROM", "email_from"),
+    ("SMTP_HOST", "host"),
+    ("SMTP_USERNAME", "username"),
+    ("SMTP_PASSWORD", "password"),
+)
+
+
 def get_missing_smtp_env_keys() -> List[str]:
     """Get list of missing required SMTP environment variables."""
-    required_keys = ["EMAIL_FROM", "SMTP_HOST", "SMTP_USERNAME", "SMTP_PASSWORD"]
-    missing = [key for key in required_keys if not os.getenv(key)]
+    missing = [key for key, _ in _REQUIRED_SMTP_KEYS if not os.getenv(key)]
     return missing
 
 
+@dataclass(frozen=True)
+class SMTPConfig:
+    """A snapshot of the SMTP settings taken from the environment."""
+    email_from: Optional[str]
+    email_from_name: str
+    host: Optional[str]
+    port: int
+    username: Optional[str]
+    password: Optional[str]
+    secure_mode: str
+    timeout: int
+    debug: int
+
+    def missing_keys(self) -> List[str]:
+        """Get list of required SMTP environment variables missing from this snapshot."""
+        return [key for key, field in _REQUIRED_SMTP_KEYS if not getattr(self, field)]
+
+
+@functools.lru_cache(maxsize=1)
+def _smtp_config() -> SMTPConfig:
+    """Snapshot SMTP settings from the environment (cached until reloaded)."""
+    return SMTPConfig(
+        email_from=os.getenv("EMAIL_FROM"),
+        email_from_name=os.getenv("EMAIL_FROM_NAME", "Learning Path Bot"),
+        host=os.getenv("SMTP_HOST"),
+        port=int(os.getenv("SMTP_PORT", "587")),
+        username=os.getenv("SMTP_USERNAME"),
+        password=os.getenv("SMTP_PASSWORD"),
+        secure_mode=os.getenv("SMTP_SECURE", "starttls").lower(),
+        timeout=int(os.getenv("SMTP_TIMEOUT", "30")),
+        debug=int(os.getenv("SMTP_DEBUG", "0")),
+    )
+
+
+def reload_smtp_config() -> None:
+    """Drop cached SMTP settings so the next send re-reads the environment."""
+    _smtp_config.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    """Return a shared default SSL context (loading the CA store is slow)."""
+    return ssl.create_default_context()
+
+
+@contextmanager
+def map_attachment(path: str) -> Iterator[memoryview]:
+    """Memory-map a file read-only and yield a zero-copy view of its bytes.
+
+    EmailMessage base64-encodes bytes-like content slice by slice, so attaching
+    the view avoids holding a separate in-memory copy of the raw file.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            yield view
+
+
+class SMTPSession:
+    """A reusable SMTP connection for sending several emails with one login.
+
+    The connection is opened lazily on the first send and health-checked with
+    NOOP before each later send, reconnecting if the server dropped it.
+    """
+
+    def __init__(self, config: Optional[SMTPConfig] = None) -> None:
+        self.config = config or _smtp_config()
+        self._server: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Connect (and authenticate) to the SMTP server."""
+        config = self.config
+        if config.secure_mode == "ssl":
+            server = smtplib.SMTP_SSL(config.host, config.port, timeout=config.timeout, context=_ssl_context())
+        else:  # default to starttls or none
+            server = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+        try:
+            if config.debug:
+                server.set_debuglevel(config.debug)
+            if config.secure_mode == "starttls":
+                server.starttls(context=_ssl_context())
+            server.login(config.username, config.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def close(self) -> None:
+        """Close the SMTP connection if one is open."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def _is_alive(self) -> bool:
+        """Return True if the current connection still answers NOOP."""
+        if self._server is None:
+            return False
+        try:
+            return self._server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+
+    def send_message(self, msg: EmailMessage) -> None:
+        """Send a message, (re)connecting first if needed."""
+        if not self._is_alive():
+            self.close()
+            self.open()
+        self._server.send_message(msg)
+
+
 def send_email_with_attachment(
     to_address: str,
     subject: str,
     body_text: str,
-    attachment_bytes: bytes,
+    attachment_bytes: Union[bytes, memoryview],
     attachment_filename: str,
+    session: Optional[SMTPSession] = None,
 ) -> bool:
-    """Send email via SMTP with an attached PDF. Returns True on success."""
-    email_from = os.getenv("EMAIL_FROM")
-    email_from_name = os.getenv("EMAIL_FROM_NAME", "Learning Path Bot")
-    smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_username = os.getenv("SMTP_USERNAME")
-    smtp_password = os.getenv("SMTP_PASSWORD")
-    smtp_secure_mode = os.getenv("SMTP_SECURE", "starttls").lower()
-    smtp_timeout = int(os.getenv("SMTP_TIMEOUT", "30"))
-    smtp_debug = int(os.getenv("SMTP_DEBUG", "0"))
-
-    missing_keys = get_missing_smtp_env_keys()
+    """Send email via SMTP with an attached PDF. Returns True on success.
+
+    Pass an open ``SMTPSession`` to reuse its connection across several sends;
+    otherwise a session is created and closed for this one email.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = SMTPSession()
+
+    # Check the same settings snapshot the session will send with
+    missing_keys = session.config.missing_keys()
     if missing_keys:
-        if smtp_debug:
+        if session.config.debug:
             print(f"Missing SMTP environment variables: {', '.join(missing_keys)}")
         return False
 
     msg = EmailMessage()
-    msg["From"] = f"{email_from_name} <{email_from}>"
+    msg["From"] = f"{session.config.email_from_name} <{session.config.email_from}>"
     msg["To"] = to_address
     msg["Subject"] = subject
     msg.set_content(body_text)
@@ -479,26 +913,14 @@ def send_email_with_attachment(
     )
 
     try:
-        if smtp_secure_mode == "ssl":
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(smtp_host, smtp_port, timeout=smtp_timeout, context=context) as server:
-                if smtp_debug:
-                    server.set_debuglevel(smtp_debug)
-                server.login(smtp_username, smtp_password)
-                server.send_message(msg)
-        else:  # default to starttls or none
-            with smtplib.SMTP(smtp_host, smtp_port, timeout=smtp_timeout) as server:
-                if smtp_debug:
-                    server.set_debuglevel(smtp_debug)
-                if smtp_secure_mode == "starttls":
-                    context = ssl.create_default_context()
-                    server.starttls(context=context)
-                server.login(smtp_username, smtp_password)
-                server.send_message(msg)
+        session.send_message(msg)
         return True
     except Exception as e:
-        if smtp_debug:
+        if session.config.debug:
             print(f"Email send failed: {e}")
         return False
+    finally:
+        if owns_session:
+            session.close()
 
 